@@ -1,11 +1,73 @@
 import os
 import sys
 import argparse
+import codecs
+import collections
 import datetime
+import functools
 import configparser
+import re
+import itertools
 import tkinter as tk
 from tkinter import filedialog, ttk, messagebox
+import tkinter.font as tkfont
 import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Syntax highlighting language for each (lowercase) file extension
+LANGUAGE_MAP = {
+    '.kt': 'kotlin',
+    '.java': 'java',
+    '.cpp': 'cpp',
+    '.h': 'cpp',
+    '.xml': 'xml',
+    '.json': 'json',
+    '.mjs': 'javascript',
+    '.yaml': 'yaml',
+    '.yml': 'yaml',
+    '.config': 'ini',
+    '.tsx': 'tsx',
+    '.ts': 'typescript',
+    '.jsx': 'jsx',
+    '.js': 'javascript',
+    '.html': 'html',
+    '.css': 'css',
+    '.cs': 'csharp',
+    '.go': 'go',
+    '.py': 'python',
+    '.rb': 'ruby',
+    '.php': 'php',
+    '.swift': 'swift',
+    '.sh': 'bash',
+    '.bash': 'bash',
+    '.txt': 'text',
+    '.md': 'markdown',
+    '.sql': 'sql',
+}
+
+# Pre-encoded code fences, so rendering a file needs no formatting or encoding
+_FENCE_OPEN = {lang: f"```{lang}\n".encode('utf-8') for lang in {*LANGUAGE_MAP.values(), 'text'}}
+_FENCE_CLOSE = b"\n```\n\n"
+
+# Characters that, directly before the last dot, mean splitext would not
+# treat the suffix as an extension (hidden files like .config, or a dot
+# that starts a path component)
+_EXTENSION_GUARD = '.' + os.sep + (os.altsep or '')
+
+def compile_exclusions(patterns):
+    """
+    Split file exclusion patterns into (exact names, suffixes, prefixes) so
+    each can be checked with a single set lookup or str.endswith/startswith call
+    """
+    exact = frozenset(patterns)
+    suffixes = tuple(p[1:] for p in patterns if p.startswith('*'))
+    prefixes = tuple(p[:-1] for p in patterns if p.endswith('*'))
+    return exact, suffixes, prefixes
+
+def is_excluded_file(filename, exclusions):
+    """Check a file name against exclusions built by compile_exclusions"""
+    exact, suffixes, prefixes = exclusions
+    return filename in exact or filename.endswith(suffixes) or filename.startswith(prefixes)
 
 def collect_files_from_dir(directory, extensions, include_subdirs, excluded_dirs=None, excluded_files=None):
     """
@@ -16,97 +78,307 @@ def collect_files_from_dir(directory, extensions, include_subdirs, excluded_dirs
     if excluded_files is None:
         excluded_files = []
 
-    # Convert excluded_dirs to absolute paths for more reliable comparison
-    abs_excluded_dirs = [os.path.abspath(os.path.join(directory, d)) for d in excluded_dirs]
+    # A tuple lets str.endswith test every extension in a single call
+    extensions = tuple(extensions)
+
+    # Convert excluded_dirs to absolute paths for more reliable comparison.
+    # abspath is resolved once for the base (it calls getcwd); the rest is
+    # lexical. Their basenames give a cheap first check, so the full path
+    # only has to be built for directories whose name could match.
+    abs_directory = os.path.abspath(directory)
+    abs_prefix = abs_directory.rstrip(os.sep) + os.sep
+    abs_excluded_dirs = frozenset(os.path.normpath(os.path.join(abs_directory, d)) for d in excluded_dirs)
+    excluded_dir_names = {os.path.basename(d) for d in abs_excluded_dirs}
+
+    exclusions = compile_exclusions(excluded_files)
 
     file_paths = []
     if include_subdirs:
-        for root, dirs, files in os.walk(directory):
-            # Skip excluded directories
-            abs_root = os.path.abspath(root)
-            if any(abs_root == d or abs_root.startswith(d + os.sep) for d in abs_excluded_dirs):
+        if abs_directory in abs_excluded_dirs:
+            return file_paths
+
+        # Depth-first walk with os.scandir, visiting entries in the same order
+        # as os.walk. Excluded directories are never pushed, so their subtrees
+        # are not read at all.
+        stack = [directory]
+        while stack:
+            dir_path = stack.pop()
+            subdirs = []
+            try:
+                with os.scandir(dir_path) as it:
+                    for entry in it:
+                        # DirEntry caches the file type from readdir, so no extra stat
+                        if entry.is_dir():
+                            # Like os.walk, don't follow symlinked directories
+                            if entry.is_symlink():
+                                continue
+                            if entry.name in excluded_dir_names:
+                                rel_subdir = entry.path[len(directory):].lstrip(os.sep)
+                                if abs_prefix + rel_subdir in abs_excluded_dirs:
+                                    continue
+                            subdirs.append(entry.path)
+                        elif entry.name.endswith(extensions) and not is_excluded_file(entry.name, exclusions):
+                            file_paths.append(entry.path)
+            except OSError:
+                # Unreadable directories are skipped, as os.walk does
                 continue
+            stack.extend(reversed(subdirs))
+    else:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(extensions) and not is_excluded_file(entry.name, exclusions):
+                    file_paths.append(entry.path)
+    return file_paths
 
-            for file in files:
-                if any(file.endswith(ext) for ext in extensions):
-                    # Check if file matches any exclusion pattern
-                    if any(file == excluded_file or
-                           (excluded_file.startswith('*') and file.endswith(excluded_file[1:])) or
-                           (excluded_file.endswith('*') and file.startswith(excluded_file[:-1])) for excluded_file in excluded_files):
-                        continue
+def collect_files_from_sections(directory, config, global_excluded_dirs, global_excluded_files):
+    """
+    Scan every directory section of a parsed config, one thread per section.
+    Yields (dir_path, collected_files) pairs in config order; collected_files
+    is None when the section's directory does not exist.
+    """
+    jobs = []
+    for section in config.sections():
+        if section in ['specific_files', 'global']:
+            continue  # Handle these sections separately
 
-                    file_paths.append(os.path.join(root, file))
-    else:
-        for file in os.listdir(directory):
-            file_path = os.path.join(directory, file)
-            if os.path.isfile(file_path) and any(file.endswith(ext) for ext in extensions):
-                # Check exclusion patterns
-                if any(file == excluded_file or
-                       (excluded_file.startswith('*') and file.endswith(excluded_file[1:])) or
-                       (excluded_file.endswith('*') and file.startswith(excluded_file[:-1])) for excluded_file in excluded_files):
-                    continue
+        # Handle relative directories from the base
+        dir_path = os.path.join(directory, section)
+        if not _path_exists(dir_path):
+            jobs.append((dir_path, None))
+            continue
 
-                file_paths.append(file_path)
-    return file_paths
+        # Parse section-specific configurations
+        extensions = parse_list_from_config(config.get(section, 'extensions'))
+        extensions = tuple(f'.{ext}' if not ext.startswith('.') else ext for ext in extensions)
+        include_subdirs = config.getboolean(section, 'include_subdirs', fallback=True)
 
-def create_markdown_content(file_paths, base_directory):
-    markdown_content = f"# Project Code Collection\n\n"
-    markdown_content += f"Generated on: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        # Section-specific exclusions combine with global exclusions
+        excluded_dirs = global_excluded_dirs.copy()
+        excluded_files = global_excluded_files.copy()
+
+        if config.has_option(section, 'excluded_dirs'):
+            section_excluded_dirs = parse_list_from_config(config.get(section, 'excluded_dirs'))
+            excluded_dirs.extend(section_excluded_dirs)
+
+        if config.has_option(section, 'excluded_files'):
+            section_excluded_files = parse_list_from_config(config.get(section, 'excluded_files'))
+            excluded_files.extend(section_excluded_files)
+
+        jobs.append((dir_path, (dir_path, extensions, include_subdirs, excluded_dirs, excluded_files)))
+
+    # Each section walks its own subtree, so the walks can overlap.
+    # executor.map returns results in submission order, keeping output stable,
+    # and each section is yielded as soon as it and those before it are done.
+    scan_args = [args for _, args in jobs if args is not None]
+    with ThreadPoolExecutor(max_workers=min(16, len(scan_args) or 1)) as executor:
+        results = executor.map(lambda args: collect_files_from_dir(*args), scan_args)
+        for dir_path, args in jobs:
+            yield dir_path, (next(results) if args is not None else None)
+
+def check_specific_files(directory, specific_files):
+    """
+    Resolve specific files against the base directory and check that each
+    exists. The checks run concurrently, which overlaps stat latency on slow
+    or network file systems. Returns (specific_file, full_path, is_file)
+    tuples in the given order.
+    """
+    full_paths = [os.path.join(directory, specific_file) for specific_file in specific_files]
+    with ThreadPoolExecutor(max_workers=min(16, len(full_paths) or 1)) as executor:
+        is_files = list(executor.map(_path_isfile, full_paths))
+    return list(zip(specific_files, full_paths, is_files))
 
-    for file_path in sorted(file_paths):
+# Files larger than this are copied to the output in blocks of this size
+# instead of being read into memory whole
+STREAM_BLOCK_SIZE = 1 << 20
+
+# Write buffer for the markdown output. Sections are many small writes, so
+# a large buffer turns them into few large write calls.
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+_O_NOATIME = getattr(os, 'O_NOATIME', 0)
+
+def _source_opener(path, flags):
+    """Opener that skips access-time updates on platforms that support it"""
+    if _O_NOATIME:
         try:
-            # Determine language for syntax highlighting
-            file_ext = os.path.splitext(file_path)[1].lower()
-            lang = get_language_by_extension(file_ext)
-
-            relative_path = os.path.relpath(file_path, base_directory)
-            markdown_content += f"## {relative_path}\n\n"
-            with open(file_path, 'r', encoding='utf-8', errors='replace') as file:
-                content = file.read()
-                markdown_content += f"```{lang}\n{content}\n```\n\n"
-        except Exception as e:
-            markdown_content += f"Error reading {file_path}: {str(e)}\n\n"
-    return markdown_content
+            return os.open(path, flags | _O_NOATIME)
+        except PermissionError:
+            # O_NOATIME is only permitted on files we own
+            pass
+    return os.open(path, flags)
+
+def _open_source(file_path):
+    """
+    Open a source file for reading. Sources are read whole or in large
+    blocks, so Python's buffer would only add a copy; read unbuffered.
+    """
+    return open(file_path, 'rb', buffering=0, opener=_source_opener)
+
+def _normalize_source(content):
+    """
+    Convert raw source bytes to valid UTF-8 with newlines normalized to \\n,
+    matching what a text-mode read with errors='replace' would produce
+    """
+    # Pure ASCII is already valid UTF-8, so most source files skip the codec.
+    # Anything else is round-tripped so invalid bytes become U+FFFD.
+    if not content.isascii():
+        content = content.decode('utf-8', errors='replace').encode('utf-8')
+    if b'\r' in content:
+        content = content.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    return content
+
+def _iter_source_blocks(file_path, block_size=STREAM_BLOCK_SIZE):
+    """
+    Yield a large source file in normalized blocks. Multi-byte characters
+    and CRLF pairs split across block boundaries are carried over so the
+    result is identical to normalizing the whole file at once.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    pending_cr = False
+    with _open_source(file_path) as file:
+        while True:
+            block = file.read(block_size)
+            final = not block
+            if not block.isascii() or decoder.getstate()[0]:
+                block = decoder.decode(block, final).encode('utf-8')
+            if pending_cr:
+                block = b'\r' + block
+            pending_cr = not final and block.endswith(b'\r')
+            if pending_cr:
+                block = block[:-1]
+            if b'\r' in block:
+                block = block.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+            if block:
+                yield block
+            if final:
+                return
+
+def _make_relpath(base_directory):
+    """
+    Return a function equivalent to os.path.relpath(path, base_directory)
+    for paths built by joining onto base_directory. It slices off the base
+    prefix instead of letting relpath resolve both paths with abspath, which
+    calls getcwd each time; anything else falls back to os.path.relpath.
+    """
+    prefix = base_directory.rstrip(os.sep) + os.sep
+
+    def relpath(path):
+        if base_directory and path.startswith(prefix):
+            rel_path = os.path.normpath(path[len(prefix):].lstrip(os.sep))
+            # A '..' that climbs out of the base needs real resolution
+            if rel_path != os.pardir and not rel_path.startswith(os.pardir + os.sep):
+                return rel_path
+        return os.path.relpath(path, base_directory)
+
+    return relpath
+
+def _render_one(file_path, relative_path):
+    """
+    Render a single file as UTF-8 encoded markdown. Returns a list of
+    byte chunks; files larger than STREAM_BLOCK_SIZE appear as their path,
+    to be copied in blocks when the section is written.
+    """
+    parts = []
+    try:
+        # Determine language for syntax highlighting
+        lang = _language_for_path(file_path)
+
+        parts.append(f"## {relative_path}\n\n".encode('utf-8', errors='replace'))
+        with _open_source(file_path) as file:
+            if os.fstat(file.fileno()).st_size > STREAM_BLOCK_SIZE:
+                content = file_path
+            else:
+                content = _normalize_source(file.read())
+        parts.append(_FENCE_OPEN[lang])
+        parts.append(content)
+        parts.append(_FENCE_CLOSE)
+    except Exception as e:
+        parts.append(f"Error reading {file_path}: {str(e)}\n\n".encode('utf-8', errors='replace'))
+    return parts
+
+def _markdown_header():
+    return (f"# Project Code Collection\n\n"
+            f"Generated on: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n").encode('utf-8')
+
+def _sorted_relative_paths(file_paths, base_directory):
+    """
+    Return (relative_path, file_path) pairs sorted by relative path, so each
+    relative path is computed once and the output follows the headings
+    """
+    relpath = _make_relpath(base_directory)
+    pairs = []
+    for file_path in file_paths:
+        try:
+            relative_path = relpath(file_path)
+        except ValueError:
+            # No relative path exists (e.g. another drive on Windows)
+            relative_path = file_path
+        pairs.append((relative_path, file_path))
+    pairs.sort()
+    return pairs
+
+def _render_all(file_paths, base_directory):
+    """Yield the markdown byte chunks for each file, in sorted path order"""
+    pairs = iter(_sorted_relative_paths(file_paths, base_directory))
+    # Reading is I/O-bound, so overlap the per-file reads across threads while
+    # this thread writes. Only a bounded window of reads is in flight, so a
+    # slow writer doesn't let rendered files pile up in memory. Results are
+    # taken in submission order, keeping the output sorted.
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = collections.deque(
+            executor.submit(_render_one, file_path, relative_path)
+            for relative_path, file_path in itertools.islice(pairs, max_workers * 2))
+        while pending:
+            parts = pending.popleft().result()
+            nxt = next(pairs, None)
+            if nxt:
+                relative_path, file_path = nxt
+                pending.append(executor.submit(_render_one, file_path, relative_path))
+            for part in parts:
+                if isinstance(part, bytes):
+                    yield part
+                    continue
+                # A large file deferred by _render_one
+                try:
+                    yield from _iter_source_blocks(part)
+                except Exception as e:
+                    yield f"\nError reading {part}: {str(e)}\n".encode('utf-8', errors='replace')
+
+def create_markdown_content(file_paths, base_directory):
+    parts = [_markdown_header()]
+    parts.extend(_render_all(file_paths, base_directory))
+    return b''.join(parts).decode('utf-8')
+
+def write_markdown_stream(file_paths, base_directory, output_file):
+    """
+    Write the markdown document chunk by chunk to a file opened in binary
+    mode, without building the whole document in memory. Returns the
+    number of bytes written.
+    """
+    written = output_file.write(_markdown_header())
+    for chunk in _render_all(file_paths, base_directory):
+        written += output_file.write(chunk)
+    return written
 
 def get_language_by_extension(extension):
-    language_map = {
-        '.kt': 'kotlin',
-        '.java': 'java',
-        '.cpp': 'cpp',
-        '.h': 'cpp',
-        '.xml': 'xml',
-        '.json': 'json',
-        '.mjs': 'javascript',
-        '.yaml': 'yaml',
-        '.yml': 'yaml',
-        '.config': 'ini',
-        '.tsx': 'tsx',
-        '.ts': 'typescript',
-        '.jsx': 'jsx',
-        '.js': 'javascript',
-        '.html': 'html',
-        '.css': 'css',
-        '.cs': 'csharp',
-        '.go': 'go',
-        '.py': 'python',
-        '.rb': 'ruby',
-        '.php': 'php',
-        '.swift': 'swift',
-        '.sh': 'bash',
-        '.bash': 'bash',
-        '.txt': 'text',
-        '.md': 'markdown',
-        '.sql': 'sql',
-    }
-    return language_map.get(extension, 'text')
+    return LANGUAGE_MAP.get(extension, 'text')
+
+def _language_for_path(file_path):
+    """Language for a file path, without the allocations of os.path.splitext"""
+    dot = file_path.rfind('.')
+    # When a non-dot name character precedes the last dot, the suffix from
+    # that dot is exactly what splitext would return (a dot inside a
+    # directory name leaves a separator in the suffix, which never matches)
+    if dot > 0 and file_path[dot - 1] not in _EXTENSION_GUARD:
+        return LANGUAGE_MAP.get(file_path[dot:].lower(), 'text')
+    return get_language_by_extension(os.path.splitext(file_path)[1].lower())
+
+_LIST_SEPARATOR_RE = re.compile(r'[,\n]')
 
 def parse_list_from_config(config_text):
     """Parse a comma or newline separated list from config"""
-    if not config_text:
-        return []
-    if ',' in config_text:
-        return [item.strip() for item in config_text.split(',') if item.strip()]
-    return [item.strip() for item in config_text.split('\n') if item.strip()]
+    return [item for item in map(str.strip, _LIST_SEPARATOR_RE.split(config_text or '')) if item]
 
 def ensure_directory_exists(file_path):
     """Ensure directory exists for the given file path"""
@@ -115,6 +387,22 @@ def ensure_directory_exists(file_path):
         os.makedirs(directory)
         print(f"Created directory: {directory}")
 
+# Memoized path checks for the scan phase. Config sections and specific
+# files can name the same paths, so repeated checks skip the stat call.
+# Long-lived callers (the GUI) clear these before each scan.
+@functools.lru_cache(maxsize=4096)
+def _path_exists(path):
+    return os.path.exists(path)
+
+@functools.lru_cache(maxsize=4096)
+def _path_isfile(path):
+    return os.path.isfile(path)
+
+def clear_path_cache():
+    """Forget memoized path checks so a new scan sees current disk state"""
+    _path_exists.cache_clear()
+    _path_isfile.cache_clear()
+
 def find_config_file(config_name):
     """
     Find the configuration file by searching in the following locations:
@@ -142,31 +430,51 @@ def find_config_file(config_name):
 
     return None
 
+def _file_signature(path):
+    """Modification time and size of a path, or None if it doesn't exist"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+@functools.lru_cache(maxsize=32)
+def _load_config(config_path, signature):
+    config = configparser.ConfigParser()
+    config.read(config_path)
+    return config
+
+def load_config(config_path):
+    """
+    Parse a config file. The result is cached on the file's modification
+    time and size, so repeated scans reuse it until the file changes.
+    """
+    return _load_config(config_path, _file_signature(config_path))
+
 def get_available_configs():
     """Get a list of available configuration files"""
     script_dir = os.path.dirname(__file__)
     configs_dir = os.path.join(script_dir, "configs")
 
     config_files = []
+    seen = set()
 
-    # Check configs directory
-    if os.path.exists(configs_dir):
-        for file in os.listdir(configs_dir):
-            if file.endswith('.config'):
+    # configs/ directory first, then the script directory
+    for directory in (configs_dir, script_dir):
+        if not os.path.isdir(directory):
+            continue
+        with os.scandir(directory) as it:
+            for entry in it:
+                name = entry.name
+                if not name.endswith('.config'):
+                    continue
                 # Extract the config name without extension
-                config_name = os.path.splitext(file)[0]
+                config_name = os.path.splitext(name)[0]
                 if config_name.endswith('_extract'):
                     config_name = config_name[:-8]  # Remove _extract suffix
-                config_files.append(config_name)
-
-    # Check script directory
-    for file in os.listdir(script_dir):
-        if file.endswith('.config'):
-            config_name = os.path.splitext(file)[0]
-            if config_name.endswith('_extract'):
-                config_name = config_name[:-8]  # Remove _extract suffix
-            if config_name not in config_files:
-                config_files.append(config_name)
+                if config_name not in seen:
+                    seen.add(config_name)
+                    config_files.append(config_name)
 
     return config_files
 
@@ -182,9 +490,11 @@ class CodeExtractorUI:
         self.output_var = tk.StringVar(value="code.txt")
         self.status_var = tk.StringVar(value="Ready")
 
-        # Dictionary to store file checkboxes and their variables
-        # Key: file path, Value: (BooleanVar, relative path)
-        self.file_checkboxes = {}
+        # Files from the last scan as (full path, relative path) in display
+        # order; the row at index i has item id str(i)
+        self.file_items = []
+        # Full paths of the files currently selected for extraction
+        self.selected = set()
 
         # Create main frame
         self.main_frame = ttk.Frame(root, padding="10")
@@ -217,18 +527,21 @@ class CodeExtractorUI:
         self.file_scroll_x = ttk.Scrollbar(self.file_frame, orient=tk.HORIZONTAL)
         self.file_scroll_x.pack(side=tk.BOTTOM, fill=tk.X)
 
-        # Canvas for scrolling
-        self.file_canvas = tk.Canvas(self.file_frame)
-        self.file_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        # A single Treeview lists the files. Creating one Checkbutton per file
+        # froze the UI on large projects; tree rows are cheap and drawn lazily.
+        self.file_tree = ttk.Treeview(self.file_frame, show="tree", selectmode="browse")
+        self.file_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
         # Configure scrollbars
-        self.file_scroll_y.config(command=self.file_canvas.yview)
-        self.file_scroll_x.config(command=self.file_canvas.xview)
-        self.file_canvas.config(yscrollcommand=self.file_scroll_y.set, xscrollcommand=self.file_scroll_x.set)
+        self.file_scroll_y.config(command=self.file_tree.yview)
+        self.file_scroll_x.config(command=self.file_tree.xview)
+        self.file_tree.config(yscrollcommand=self.file_scroll_y.set, xscrollcommand=self.file_scroll_x.set)
 
-        # Inner frame for file checkboxes
-        self.file_list_frame = ttk.Frame(self.file_canvas)
-        self.file_canvas.create_window((0, 0), window=self.file_list_frame, anchor=tk.NW)
+        # Clicking a row, or pressing Space/Enter on the focused row,
+        # toggles whether that file is selected
+        self.file_tree.bind("<Button-1>", self.on_file_click)
+        self.file_tree.bind("<space>", self.on_file_key)
+        self.file_tree.bind("<Return>", self.on_file_key)
 
         # Selection controls
         self.controls_frame = ttk.Frame(self.main_frame)
@@ -252,18 +565,38 @@ class CodeExtractorUI:
         # Populate the config combobox
         self.populate_configs()
 
-        # Configure the canvas resize
-        self.file_list_frame.bind("<Configure>", self.on_frame_configure)
-        self.file_canvas.bind("<Configure>", self.on_canvas_configure)
+    def file_label(self, full_path, rel_path):
+        """Row text for a file, with its check mark"""
+        mark = "[x]" if full_path in self.selected else "[ ]"
+        return f"{mark} {rel_path}"
+
+    def refresh_file_marks(self):
+        """Redraw the check mark on every row"""
+        for i, (full_path, rel_path) in enumerate(self.file_items):
+            self.file_tree.item(str(i), text=self.file_label(full_path, rel_path))
+
+    def clear_file_list(self):
+        """Remove all files from the list"""
+        self.file_tree.delete(*self.file_tree.get_children())
+        self.file_items = []
+        self.selected = set()
+
+    def toggle_file(self, item_id):
+        """Toggle the file in the given row"""
+        if not item_id:
+            return
+        full_path, rel_path = self.file_items[int(item_id)]
+        self.selected ^= {full_path}
+        self.file_tree.item(item_id, text=self.file_label(full_path, rel_path))
 
-    def on_frame_configure(self, event):
-        """Reset the scroll region to encompass the inner frame"""
-        self.file_canvas.configure(scrollregion=self.file_canvas.bbox("all"))
+    def on_file_click(self, event):
+        """Toggle the file in the clicked row"""
+        self.toggle_file(self.file_tree.identify_row(event.y))
 
-    def on_canvas_configure(self, event):
-        """Update the inner frame's width to fill the canvas"""
-        canvas_width = event.width
-        self.file_canvas.itemconfig(1, width=canvas_width)
+    def on_file_key(self, event):
+        """Toggle the file in the focused row"""
+        self.toggle_file(self.file_tree.focus())
+        return "break"
 
     def populate_configs(self):
         """Populate the config combobox with available configs"""
@@ -297,23 +630,29 @@ class CodeExtractorUI:
             messagebox.showerror("Config Error", f"Config file for '{config_name}' not found.")
             return
 
+        # Parse the config once here (cached until the file changes) and hand
+        # the parsed object to the scan thread
+        try:
+            config = load_config(config_path)
+        except (configparser.Error, UnicodeDecodeError) as e:
+            messagebox.showerror("Config Error", f"Could not parse '{os.path.basename(config_path)}':\n{e}")
+            return
+
         # Clear previous file list
-        for widget in self.file_list_frame.winfo_children():
-            widget.destroy()
-        self.file_checkboxes.clear()
+        self.clear_file_list()
 
         # Update status
         self.status_var.set(f"Scanning files with config: {os.path.basename(config_path)}...")
         self.root.update_idletasks()
 
         # Start scanning in a separate thread
-        threading.Thread(target=self.perform_scan, args=(directory, config_path)).start()
+        threading.Thread(target=self.perform_scan, args=(directory, config)).start()
 
-    def perform_scan(self, directory, config_path):
+    def perform_scan(self, directory, config):
         """Perform the file scan in a separate thread"""
         try:
-            config = configparser.ConfigParser()
-            config.read(config_path)
+            # Files may have changed since the last scan in this session
+            clear_path_cache()
 
             # Parse global exclusions if present
             global_excluded_dirs = []
@@ -327,62 +666,40 @@ class CodeExtractorUI:
                     global_excluded_files = parse_list_from_config(config['global']['excluded_files'])
 
             file_paths = []
+            # Normalized paths already collected, so files matched by overlapping
+            # sections or listed again under specific_files are only included once
+            seen = set()
 
             # Process each section
-            for section in config.sections():
-                if section in ['specific_files', 'global']:
-                    continue  # Handle these sections separately
-
-                # Handle relative directories from the base
-                dir_path = os.path.join(directory, section)
-                if not os.path.exists(dir_path):
+            for dir_path, collected in collect_files_from_sections(
+                    directory, config, global_excluded_dirs, global_excluded_files):
+                if collected is None:
                     print(f"Warning: Directory '{dir_path}' does not exist. Skipping...")
                     continue
 
-                # Parse section-specific configurations
-                extensions = parse_list_from_config(config.get(section, 'extensions'))
-                extensions = [f'.{ext}' if not ext.startswith('.') else ext for ext in extensions]
-                include_subdirs = config.getboolean(section, 'include_subdirs', fallback=True)
-
-                # Section-specific exclusions combine with global exclusions
-                excluded_dirs = global_excluded_dirs.copy()
-                excluded_files = global_excluded_files.copy()
-
-                if 'excluded_dirs' in config[section]:
-                    section_excluded_dirs = parse_list_from_config(config[section]['excluded_dirs'])
-                    excluded_dirs.extend(section_excluded_dirs)
-
-                if 'excluded_files' in config[section]:
-                    section_excluded_files = parse_list_from_config(config[section]['excluded_files'])
-                    excluded_files.extend(section_excluded_files)
-
-                collected = collect_files_from_dir(
-                    dir_path,
-                    extensions,
-                    include_subdirs,
-                    excluded_dirs,
-                    excluded_files
-                )
-                file_paths.extend(collected)
+                for path in collected:
+                    key = os.path.normpath(path)
+                    if key not in seen:
+                        seen.add(key)
+                        file_paths.append(path)
 
             # Handle specific files
             if 'specific_files' in config.sections():
+                global_exclusions = compile_exclusions(global_excluded_files)
                 specific_files_text = config.get('specific_files', 'files')
                 specific_files = parse_list_from_config(specific_files_text)
 
                 # Process the specific files
-                for specific_file in specific_files:
-                    full_path = os.path.join(directory, specific_file)
-                    if os.path.isfile(full_path):
+                for specific_file, full_path, is_file in check_specific_files(directory, specific_files):
+                    if is_file:
                         # Check if this file is excluded globally
                         filename = os.path.basename(specific_file)
-                        if any(filename == excluded_file or
-                               (excluded_file.startswith('*') and filename.endswith(excluded_file[1:])) or
-                               (excluded_file.endswith('*') and filename.startswith(excluded_file[:-1]))
-                               for excluded_file in global_excluded_files):
+                        if is_excluded_file(filename, global_exclusions):
                             continue
 
-                        if full_path not in file_paths:
+                        key = os.path.normpath(full_path)
+                        if key not in seen:
+                            seen.add(key)
                             file_paths.append(full_path)
                     else:
                         print(f"Warning: Specific file '{specific_file}' not found. Skipping...")
@@ -396,28 +713,22 @@ class CodeExtractorUI:
     def update_file_list(self, file_paths, base_directory):
         """Update the UI with the file list"""
         # Clear any existing file list
-        for widget in self.file_list_frame.winfo_children():
-            widget.destroy()
-
-        self.file_checkboxes.clear()
+        self.clear_file_list()
 
-        # Sort file paths by relative path
-        rel_paths = [(path, os.path.relpath(path, base_directory)) for path in file_paths]
-        rel_paths.sort(key=lambda x: x[1])
+        # Sort file paths by relative path; every file starts out selected
+        self.file_items = [(full_path, rel_path) for rel_path, full_path in
+                           _sorted_relative_paths(file_paths, base_directory)]
+        self.selected = {full_path for full_path, _ in self.file_items}
 
-        # Create checkboxes for each file
-        for i, (full_path, rel_path) in enumerate(rel_paths):
-            var = tk.BooleanVar(value=True)
+        # Add a row for each file
+        for i, (full_path, rel_path) in enumerate(self.file_items):
+            self.file_tree.insert("", tk.END, iid=str(i), text=self.file_label(full_path, rel_path))
 
-            # Store the checkbox variable and relative path keyed by the full path
-            self.file_checkboxes[full_path] = (var, rel_path)
-
-            checkbox = ttk.Checkbutton(self.file_list_frame, text=rel_path, variable=var)
-            checkbox.grid(row=i, column=0, sticky="w", padx=5, pady=2)
-
-        # Update the scroll region
-        self.file_list_frame.update_idletasks()
-        self.file_canvas.configure(scrollregion=self.file_canvas.bbox("all"))
+        # Widen the column to the longest row so it can be scrolled horizontally
+        if self.file_items:
+            longest = max((self.file_label(*item) for item in self.file_items), key=len)
+            width = tkfont.nametofont("TkDefaultFont").measure(longest) + 40
+            self.file_tree.column("#0", width=width, minwidth=width)
 
         # Update status
         self.update_status(f"Found {len(file_paths)} files. Select files to extract.")
@@ -428,23 +739,25 @@ class CodeExtractorUI:
 
     def select_all(self):
         """Select all files"""
-        for var, _ in self.file_checkboxes.values():
-            var.set(True)
+        self.selected = {full_path for full_path, _ in self.file_items}
+        self.refresh_file_marks()
 
     def deselect_all(self):
         """Deselect all files"""
-        for var, _ in self.file_checkboxes.values():
-            var.set(False)
+        self.selected = set()
+        self.refresh_file_marks()
 
     def toggle_selection(self):
         """Toggle selection of all files"""
-        for var, _ in self.file_checkboxes.values():
-            var.set(not var.get())
+        self.selected = {full_path for full_path, _ in self.file_items} - self.selected
+        self.refresh_file_marks()
 
     def extract_files(self):
         """Extract selected files"""
-        # Get the selected files - only include files where the checkbox is checked
-        selected_files = [path for path, (var, _) in self.file_checkboxes.items() if var.get()]
+        # Get the selected files, in list order, with their relative paths
+        selected_items = [(path, rel_path) for path, rel_path in self.file_items if path in self.selected]
+        selected_files = [path for path, _ in selected_items]
+        selected_names = [rel_path for _, rel_path in selected_items]
 
         if not selected_files:
             messagebox.showwarning("No Files Selected", "Please select at least one file to extract.")
@@ -469,28 +782,26 @@ class CodeExtractorUI:
 
         # Start extraction in a separate thread
         base_directory = self.directory_var.get()
-        threading.Thread(target=self.perform_extraction, args=(selected_files, base_directory, output_path)).start()
+        threading.Thread(target=self.perform_extraction, args=(selected_files, selected_names, base_directory, output_path)).start()
 
-    def perform_extraction(self, file_paths, base_directory, output_path):
+    def perform_extraction(self, file_paths, file_names, base_directory, output_path):
         """Perform the extraction in a separate thread"""
         try:
-            # Generate markdown content
-            markdown_content = create_markdown_content(file_paths, base_directory)
-
             # Ensure output directory exists
             ensure_directory_exists(output_path)
 
-            # Write to file
-            with open(output_path, 'w', encoding='utf-8') as output_file:
-                output_file.write(markdown_content)
+            # Stream the markdown straight to the output file
+            with open(output_path, 'wb', buffering=OUTPUT_BUFFER_SIZE) as output_file:
+                write_markdown_stream(file_paths, base_directory, output_file)
 
-            # Generate files.txt
+            # Generate files.txt from the relative paths computed during the scan
             files_txt_path = "files.txt"
-            file_names = [os.path.relpath(file, base_directory) for file in file_paths]
 
-            with open(files_txt_path, 'w') as f:
-                for name in file_names:
-                    f.write(f"{name}\n")
+            with open(files_txt_path, 'w', encoding='utf-8') as f:
+                # One write for the whole list instead of one per line
+                if file_names:
+                    f.write("\n".join(file_names))
+                    f.write("\n")
 
             # Update status
             self.root.after(0, lambda: self.extraction_complete(output_path, len(file_paths)))
@@ -531,8 +842,7 @@ def main():
         print(f"Error: Config file for '{args.config}' not found in 'configs/' directory or script directory.")
         return
 
-    config = configparser.ConfigParser()
-    config.read(config_path)
+    config = load_config(config_path)
 
     if not os.path.isdir(args.directory):
         print(f"Error: Directory '{args.directory}' not found.")
@@ -572,91 +882,72 @@ def main():
             global_excluded_files = parse_list_from_config(config['global']['excluded_files'])
             print(f"Global excluded files: {global_excluded_files}")
 
-    file_paths = []
-
-    for section in config.sections():
-        if section in ['specific_files', 'global']:
-            continue  # Handle these sections separately
-
-        # Handle relative directories from the base
-        dir_path = os.path.join(args.directory, section)
-        if not os.path.exists(dir_path):
-            print(f"Warning: Directory '{dir_path}' does not exist. Skipping...")
-            continue
-
-        # Parse section-specific configurations
-        extensions = parse_list_from_config(config.get(section, 'extensions'))
-        extensions = [f'.{ext}' if not ext.startswith('.') else ext for ext in extensions]
-        include_subdirs = config.getboolean(section, 'include_subdirs', fallback=True)
-
-        # Section-specific exclusions combine with global exclusions
-        excluded_dirs = global_excluded_dirs.copy()
-        excluded_files = global_excluded_files.copy()
-
-        if 'excluded_dirs' in config[section]:
-            section_excluded_dirs = parse_list_from_config(config[section]['excluded_dirs'])
-            excluded_dirs.extend(section_excluded_dirs)
+    # files.txt in the current directory lists each file as it is found.
+    # The listing fills in next to it while the scan runs and only replaces
+    # the previous one once the output has been written
+    files_txt_path = "files.txt"
+    files_txt_tmp_path = files_txt_path + ".tmp"
+    relpath = _make_relpath(args.directory)
 
-        if 'excluded_files' in config[section]:
-            section_excluded_files = parse_list_from_config(config[section]['excluded_files'])
-            excluded_files.extend(section_excluded_files)
+    try:
+        with open(files_txt_tmp_path, 'w', encoding='utf-8') as files_txt:
+            file_paths = []
+            # Normalized paths already collected, so files matched by overlapping
+            # sections or listed again under specific_files are only included once
+            seen = set()
 
-        collected = collect_files_from_dir(
-            dir_path,
-            extensions,
-            include_subdirs,
-            excluded_dirs,
-            excluded_files
-        )
-        file_paths.extend(collected)
-        print(f"Found {len(collected)} files in {dir_path}")
-
-    # Handle specific files
-    if 'specific_files' in config.sections():
-        specific_files_text = config.get('specific_files', 'files')
-        specific_files = parse_list_from_config(specific_files_text)
-
-        # Process the specific files
-        for specific_file in specific_files:
-            full_path = os.path.join(args.directory, specific_file)
-            if os.path.isfile(full_path):
-                # Check if this file is excluded globally
-                filename = os.path.basename(specific_file)
-                if any(filename == excluded_file or
-                       (excluded_file.startswith('*') and filename.endswith(excluded_file[1:])) or
-                       (excluded_file.endswith('*') and filename.startswith(excluded_file[:-1]))
-                       for excluded_file in global_excluded_files):
-                    print(f"Skipping excluded specific file: {specific_file}")
+            for dir_path, collected in collect_files_from_sections(
+                    args.directory, config, global_excluded_dirs, global_excluded_files):
+                if collected is None:
+                    print(f"Warning: Directory '{dir_path}' does not exist. Skipping...")
                     continue
 
-                if full_path not in file_paths:
-                    file_paths.append(full_path)
-                print(f"Added specific file: {specific_file}")
-            else:
-                print(f"Warning: Specific file '{specific_file}' not found. Skipping...")
+                for path in collected:
+                    key = os.path.normpath(path)
+                    if key not in seen:
+                        seen.add(key)
+                        file_paths.append(path)
+                        files_txt.write(f"{relpath(path)}\n")
+                print(f"Found {len(collected)} files in {dir_path}")
 
-    if not file_paths:
-        print("No matching files found. Exiting.")
-        return
+            # Handle specific files
+            if 'specific_files' in config.sections():
+                global_exclusions = compile_exclusions(global_excluded_files)
+                specific_files_text = config.get('specific_files', 'files')
+                specific_files = parse_list_from_config(specific_files_text)
 
-    markdown_content = create_markdown_content(file_paths, args.directory)
+                # Process the specific files
+                for specific_file, full_path, is_file in check_specific_files(args.directory, specific_files):
+                    if is_file:
+                        # Check if this file is excluded globally
+                        filename = os.path.basename(specific_file)
+                        if is_excluded_file(filename, global_exclusions):
+                            print(f"Skipping excluded specific file: {specific_file}")
+                            continue
 
-    # Ensure the output directory exists before writing
-    ensure_directory_exists(output_path)
+                        key = os.path.normpath(full_path)
+                        if key not in seen:
+                            seen.add(key)
+                            file_paths.append(full_path)
+                            files_txt.write(f"{relpath(full_path)}\n")
+                        print(f"Added specific file: {specific_file}")
+                    else:
+                        print(f"Warning: Specific file '{specific_file}' not found. Skipping...")
 
-    with open(output_path, 'w', encoding='utf-8') as output_file:
-        output_file.write(markdown_content)
+        if not file_paths:
+            print("No matching files found. Exiting.")
+            return
 
-    print(f"Successfully wrote content to {output_path}")
-    print(f"Total size: {len(markdown_content):,} characters")
+        with open(output_path, 'wb', buffering=OUTPUT_BUFFER_SIZE) as output_file:
+            total_size = write_markdown_stream(file_paths, args.directory, output_file)
 
-    # Generate files.txt in the current directory
-    files_txt_path = "files.txt"
-    file_names = [os.path.relpath(file, args.directory) for file in file_paths]
+        os.replace(files_txt_tmp_path, files_txt_path)
+    finally:
+        if os.path.exists(files_txt_tmp_path):
+            os.remove(files_txt_tmp_path)
 
-    with open(files_txt_path, 'w') as f:
-        for name in file_names:
-            f.write(f"{name}\n")
+    print(f"Successfully wrote content to {output_path}")
+    print(f"Total size: {total_size:,} bytes")
     print(f"Generated {files_txt_path} listing all extracted files.")
 
 if __name__ == "__main__":